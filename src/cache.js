@@ -0,0 +1,105 @@
+/**
+ * Create a small in-memory cache whose entries expire after a fixed time to
+ * live. When the cache is full the least recently used entry is evicted.
+ * A TTL of 0 disables the cache: nothing is stored and every lookup misses.
+ * Each clear() starts a new generation, so a value computed before the clear
+ * can be kept out of the cache by passing the generation it was read in to set().
+ * @param {number} ttlMs - Time to live of an entry in milliseconds
+ * @param {number} maxEntries - Maximum number of entries kept
+ * @returns {Object} Cache with get, set, clear, generation and stats methods
+ */
+export function createTtlCache(ttlMs, maxEntries = 100) {
+  // Map iteration order is insertion order, so the first key is the least
+  // recently used one
+  const entries = new Map();
+  let currentGeneration = 0;
+  let hits = 0;
+  let misses = 0;
+
+  return {
+    /**
+     * Look up a key
+     * @param {string} key - Cache key
+     * @returns {*} The cached value, or undefined if missing or expired
+     */
+    get(key) {
+      const entry = entries.get(key);
+      if (!entry) {
+        misses += 1;
+        return undefined;
+      }
+
+      entries.delete(key);
+      if (entry.expiresAt <= Date.now()) {
+        misses += 1;
+        return undefined;
+      }
+
+      entries.set(key, entry);
+      hits += 1;
+      return entry.value;
+    },
+
+    /**
+     * Store a value under a key
+     * @param {string} key - Cache key
+     * @param {*} value - Value to cache
+     * @param {number} [generation] - Generation the value was computed in; the
+     * value is dropped if the cache has been cleared since
+     */
+    set(key, value, generation = currentGeneration) {
+      if (ttlMs <= 0 || generation !== currentGeneration) {
+        return;
+      }
+
+      entries.delete(key);
+      entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+      if (entries.size > maxEntries) {
+        entries.delete(entries.keys().next().value);
+      }
+    },
+
+    /**
+     * Remove all entries
+     */
+    clear() {
+      entries.clear();
+      currentGeneration += 1;
+    },
+
+    /**
+     * Get the current generation, which changes every time the cache is cleared
+     * @returns {number} Current generation
+     */
+    generation() {
+      return currentGeneration;
+    },
+
+    /**
+     * Get lookup counters and the number of entries held
+     * @returns {Object} Hits, misses and size
+     */
+    stats() {
+      return { hits, misses, size: entries.size };
+    }
+  };
+}
+
+/**
+ * Create a single-flight group: concurrent calls for the same key share the
+ * promise of the call already in flight instead of each starting the work
+ * @returns {Function} run(key, work) returning the shared promise of work()
+ */
+export function createSingleFlight() {
+  const inFlight = new Map();
+
+  return (key, work) => {
+    let promise = inFlight.get(key);
+    if (!promise) {
+      promise = work().finally(() => inFlight.delete(key));
+      inFlight.set(key, promise);
+    }
+    return promise;
+  };
+}
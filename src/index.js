@@ -9,45 +9,51 @@ import { fileURLToPath } from 'url';
 import { registerTools } from './tools.js';
 import { registerResources } from './resources.js';
 import { initializeSnowflakeConnection } from './snowflake.js';
-import logger from './logger.js';
+import logger, { enableFileLogging } from './logger.js';
 
 // Get the directory name of the current module
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 
-// Load environment variables from .env file
-try {
-  const envPath = path.resolve(__dirname, '../.env');
-  if (fs.existsSync(envPath)) {
-    dotenv.config({ path: envPath });
-    logger.info('Environment variables loaded from .env file');
-  } else {
-    logger.warn('No .env file found, using environment variables');
-    dotenv.config();
+/**
+ * Load environment variables, prepare the logs directory and install process
+ * handlers. Only done when the server is actually started, so importing this
+ * module has no side effects.
+ */
+function setupProcess() {
+  // Load environment variables from .env file
+  try {
+    const envPath = path.resolve(__dirname, '../.env');
+    if (fs.existsSync(envPath)) {
+      dotenv.config({ path: envPath });
+      logger.info('Environment variables loaded from .env file');
+    } else {
+      logger.warn('No .env file found, using environment variables');
+      dotenv.config();
+    }
+  } catch (error) {
+    logger.error('Error loading environment variables:', { error });
+    process.exit(1);
   }
-} catch (error) {
-  logger.error('Error loading environment variables:', { error });
-  process.exit(1);
-}
 
-// Create logs directory if it doesn't exist (for production environments)
-if (process.env.NODE_ENV === 'production') {
-  const logsDir = path.resolve(__dirname, '../logs');
-  if (!fs.existsSync(logsDir)) {
-    fs.mkdirSync(logsDir, { recursive: true });
-    logger.info('Created logs directory');
+  // Write log files in production environments
+  if (process.env.NODE_ENV === 'production') {
+    enableFileLogging(path.resolve(__dirname, '../logs'));
   }
-}
 
-// Handle uncaught exceptions and unhandled rejections
-process.on('uncaughtException', (error) => {
-  logger.error('Uncaught exception:', { error });
-  process.exit(1);
-});
+  // Handle uncaught exceptions and unhandled rejections
+  process.on('uncaughtException', (error) => {
+    logger.error('Uncaught exception:', { error });
+    process.exit(1);
+  });
 
-process.on('unhandledRejection', (reason, promise) => {
-  logger.error('Unhandled rejection:', { reason, promise });
-});
+  process.on('unhandledRejection', (reason, promise) => {
+    logger.error('Unhandled rejection:', { reason, promise });
+  });
+
+  process.on('SIGINT', handleShutdown);
+  process.on('SIGTERM', handleShutdown);
+}
 
 // Setup graceful shutdown
 function handleShutdown() {
@@ -56,10 +62,22 @@ function handleShutdown() {
   process.exit(0);
 }
 
-process.on('SIGINT', handleShutdown);
-process.on('SIGTERM', handleShutdown);
+/**
+ * Check whether this module is the script Node was started with (directly or
+ * through the package bin link)
+ * @returns {boolean} True when run as the entry point
+ */
+function isEntryPoint() {
+  try {
+    return Boolean(process.argv[1]) && fs.realpathSync(process.argv[1]) === __filename;
+  } catch {
+    return false;
+  }
+}
+
+export async function main() {
+  setupProcess();
 
-async function main() {
   try {
     logger.info('Starting Snowflake MCP Server...');
     
@@ -94,4 +112,6 @@ async function main() {
   }
 }
 
-main();
+if (isEntryPoint()) {
+  main();
+}
@@ -1,4 +1,6 @@
 import winston from 'winston';
+import fs from 'fs';
+import path from 'path';
 
 // Configure the Winston logger
 const logger = winston.createLogger({
@@ -20,19 +22,7 @@ const logger = winston.createLogger({
           }`;
         })
       ),
-    }),
-    // Add file transport for production environments
-    ...(process.env.NODE_ENV === 'production'
-      ? [
-          new winston.transports.File({ 
-            filename: 'logs/error.log', 
-            level: 'error' 
-          }),
-          new winston.transports.File({ 
-            filename: 'logs/combined.log' 
-          })
-        ]
-      : [])
+    })
   ],
 });
 
@@ -43,4 +33,20 @@ logger.stream = {
   },
 };
 
+/**
+ * Add the file transports used in production. Called when the server starts
+ * rather than at import, so importing the logger never creates or opens log files.
+ * @param {string} logsDir - Directory to write the log files to
+ */
+export function enableFileLogging(logsDir) {
+  fs.mkdirSync(logsDir, { recursive: true });
+  logger.add(new winston.transports.File({ 
+    filename: path.join(logsDir, 'error.log'), 
+    level: 'error' 
+  }));
+  logger.add(new winston.transports.File({ 
+    filename: path.join(logsDir, 'combined.log') 
+  }));
+}
+
 export default logger;
@@ -8,6 +8,13 @@ let insightsMemo = [];
 // Maximum number of insights to store in memory
 const MAX_INSIGHTS = 100;
 
+// Metadata resources backed by a single SHOW statement
+const SHOW_RESOURCES = [
+  { uri: "snowflake://metadata/databases", query: "SHOW DATABASES", label: "database" },
+  { uri: "snowflake://metadata/schemas", query: "SHOW SCHEMAS", label: "schema" },
+  { uri: "snowflake://metadata/tables", query: "SHOW TABLES", label: "table" }
+];
+
 /**
  * Register all resources with the MCP server
  * @param {McpServer} server - MCP server instance
@@ -33,95 +40,37 @@ export function registerResources(server, connection) {
     }
   );
 
-  // Register Snowflake databases metadata resource
-  server.resource(
-    "snowflake://metadata/databases",
-    new ResourceTemplate("snowflake://metadata/databases"),
-    async (uri) => {
-      logger.debug('Fetching database list');
-      try {
-        const databases = await executeQuery(connection, "SHOW DATABASES");
-        logger.info('Retrieved database list', { count: databases.length });
-        return {
-          contents: [{
-            uri: uri.href,
-            text: JSON.stringify(databases, null, 2)
-          }]
-        };
-      } catch (error) {
-        logger.error('Error fetching database list:', { error });
-        return {
-          contents: [{
-            uri: uri.href,
-            text: JSON.stringify({
-              error: error.message,
-              timestamp: new Date().toISOString()
-            }, null, 2)
-          }]
-        };
-      }
-    }
-  );
-
-  // Register Snowflake schemas metadata resource
-  server.resource(
-    "snowflake://metadata/schemas",
-    new ResourceTemplate("snowflake://metadata/schemas"),
-    async (uri) => {
-      logger.debug('Fetching schema list');
-      try {
-        const schemas = await executeQuery(connection, "SHOW SCHEMAS");
-        logger.info('Retrieved schema list', { count: schemas.length });
-        return {
-          contents: [{
-            uri: uri.href,
-            text: JSON.stringify(schemas, null, 2)
-          }]
-        };
-      } catch (error) {
-        logger.error('Error fetching schema list:', { error });
-        return {
-          contents: [{
-            uri: uri.href,
-            text: JSON.stringify({
-              error: error.message,
-              timestamp: new Date().toISOString()
-            }, null, 2)
-          }]
-        };
-      }
-    }
-  );
-
-  // Register Snowflake tables metadata resource
-  server.resource(
-    "snowflake://metadata/tables",
-    new ResourceTemplate("snowflake://metadata/tables"),
-    async (uri) => {
-      logger.debug('Fetching table list');
-      try {
-        const tables = await executeQuery(connection, "SHOW TABLES");
-        logger.info('Retrieved table list', { count: tables.length });
-        return {
-          contents: [{
-            uri: uri.href,
-            text: JSON.stringify(tables, null, 2)
-          }]
-        };
-      } catch (error) {
-        logger.error('Error fetching table list:', { error });
-        return {
-          contents: [{
-            uri: uri.href,
-            text: JSON.stringify({
-              error: error.message,
-              timestamp: new Date().toISOString()
-            }, null, 2)
-          }]
-        };
+  // Register the SHOW-based metadata resources (databases, schemas, tables)
+  for (const { uri: resourceUri, query, label } of SHOW_RESOURCES) {
+    server.resource(
+      resourceUri,
+      new ResourceTemplate(resourceUri),
+      async (uri) => {
+        logger.debug(`Fetching ${label} list`);
+        try {
+          const rows = await executeQuery(connection, query);
+          logger.info(`Retrieved ${label} list`, { count: rows.length });
+          return {
+            contents: [{
+              uri: uri.href,
+              text: JSON.stringify(rows, null, 2)
+            }]
+          };
+        } catch (error) {
+          logger.error(`Error fetching ${label} list:`, { error });
+          return {
+            contents: [{
+              uri: uri.href,
+              text: JSON.stringify({
+                error: error.message,
+                timestamp: new Date().toISOString()
+              }, null, 2)
+            }]
+          };
+        }
       }
-    }
-  );
+    );
+  }
 
   // Register Snowflake user info metadata resource
   server.resource(
@@ -130,8 +79,11 @@ export function registerResources(server, connection) {
     async (uri) => {
       logger.debug('Fetching user information');
       try {
-        const currentUser = await executeQuery(connection, "SELECT CURRENT_USER() as USER, CURRENT_ROLE() as ROLE, CURRENT_DATABASE() as DATABASE, CURRENT_SCHEMA() as SCHEMA, CURRENT_WAREHOUSE() as WAREHOUSE");
-        const userRoles = await executeQuery(connection, "SHOW ROLES");
+        // The two queries are independent, so run them concurrently on the connection
+        const [currentUser, userRoles] = await Promise.all([
+          executeQuery(connection, "SELECT CURRENT_USER() as USER, CURRENT_ROLE() as ROLE, CURRENT_DATABASE() as DATABASE, CURRENT_SCHEMA() as SCHEMA, CURRENT_WAREHOUSE() as WAREHOUSE"),
+          executeQuery(connection, "SHOW ROLES")
+        ]);
         
         logger.info('Retrieved user information');
         return {
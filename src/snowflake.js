@@ -1,4 +1,3 @@
-import snowflake from 'snowflake-sdk';
 import fs from 'fs';
 import { promisify } from 'util';
 import logger from './logger.js';
@@ -6,8 +5,20 @@ import logger from './logger.js';
 // Convert callback-based Snowflake functions to Promise-based
 const readFile = promisify(fs.readFile);
 
-// Configure Snowflake driver logging
-snowflake.configure({ logLevel: process.env.SNOWFLAKE_LOG_LEVEL || 'error' });
+// snowflake-sdk is loaded on first connection (see loadSnowflakeSdk)
+let snowflakeSdk = null;
+
+// A Snowflake identifier: unquoted (letter or underscore, then letters, digits,
+// underscores or dollar signs) or double-quoted with embedded quotes doubled
+const IDENTIFIER_PATTERN = '(?:[A-Za-z_][A-Za-z0-9_$]*|"(?:[^"]|"")+")';
+const IDENTIFIER_REGEX = new RegExp(`^${IDENTIFIER_PATTERN}$`);
+const IDENTIFIER_PARTS_REGEX = new RegExp(IDENTIFIER_PATTERN, 'g');
+
+// Leading keyword that determines the statement type
+const QUERY_TYPE_REGEX = /^\s*(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP|MERGE|TRUNCATE|SHOW|DESCRIBE)\b/i;
+
+// An object name qualified with up to a database and schema
+const QUALIFIED_NAME_REGEX = new RegExp(`^${IDENTIFIER_PATTERN}(?:\\.${IDENTIFIER_PATTERN}){0,2}$`);
 
 /**
  * Initialize Snowflake connection using credentials from environment variables
@@ -36,9 +47,21 @@ export async function initializeSnowflakeConnection() {
       warehouse: process.env.SNOWFLAKE_WAREHOUSE,
       database: process.env.SNOWFLAKE_DATABASE,
       schema: process.env.SNOWFLAKE_SCHEMA,
-      role: process.env.SNOWFLAKE_ROLE
+      role: process.env.SNOWFLAKE_ROLE,
+      // Heartbeat the session so a long idle period does not expire it; the
+      // connection is then always usable without a liveness probe
+      clientSessionKeepAlive: true
     };
 
+    // Number of result chunks the driver downloads ahead while rows are consumed
+    if (process.env.SNOWFLAKE_RESULT_PREFETCH) {
+      const resultPrefetch = parseInt(process.env.SNOWFLAKE_RESULT_PREFETCH, 10);
+      if (Number.isNaN(resultPrefetch) || resultPrefetch < 1) {
+        throw new Error('SNOWFLAKE_RESULT_PREFETCH must be a positive integer');
+      }
+      connectionConfig.resultPrefetch = resultPrefetch;
+    }
+
     // Use private key authentication if configured, otherwise use password
     if (process.env.SNOWFLAKE_PRIVATE_KEY_PATH) {
       logger.info('Using private key authentication');
@@ -69,6 +92,7 @@ export async function initializeSnowflakeConnection() {
       authenticator: connectionConfig.authenticator
     });
     
+    const snowflake = await loadSnowflakeSdk();
     const connection = snowflake.createConnection(connectionConfig);
     
     // Promisify the connect method
@@ -78,23 +102,28 @@ export async function initializeSnowflakeConnection() {
     await connectAsync();
     logger.info('Successfully connected to Snowflake');
     
-    // Add helper methods for executing queries
-    connection.executeQueryAsync = async (query, options = {}) => {
-      const queryOptions = {
-        sqlText: query,
-        complete: (err, stmt) => {
-          if (err) {
-            logger.error('Error executing query:', { error: err, query });
-          }
-        },
-        ...options
-      };
-      
-      logger.debug('Executing query:', { query: query.substring(0, 100) + (query.length > 100 ? '...' : '') });
-      const execute = promisify(connection.execute).bind(connection);
-      const statement = await execute(queryOptions);
+    // Add helper methods for executing queries. The driver reports completion
+    // through the `complete` option, which also carries the fetched rows unless
+    // the statement was executed with `streamResult`.
+    connection.executeQueryAsync = (query, options = {}) => {
+      if (logger.isDebugEnabled()) {
+        logger.debug('Executing query:', { query: query.substring(0, 100) + (query.length > 100 ? '...' : '') });
+      }
       
-      return statement;
+      return new Promise((resolve, reject) => {
+        connection.execute({
+          sqlText: query,
+          ...options,
+          complete: (err, statement, rows) => {
+            if (err) {
+              logger.error('Error executing query:', { error: err, query });
+              reject(err);
+              return;
+            }
+            resolve({ statement, rows });
+          }
+        });
+      });
     };
     
     // Add method to close the connection
@@ -112,6 +141,22 @@ export async function initializeSnowflakeConnection() {
   }
 }
 
+/**
+ * Load and configure snowflake-sdk. The driver pulls in its cloud storage and
+ * HTTP dependencies, so it is imported on first connection rather than when
+ * this module is imported.
+ * @returns {Promise<Object>} The snowflake-sdk module
+ */
+async function loadSnowflakeSdk() {
+  if (!snowflakeSdk) {
+    snowflakeSdk = (await import('snowflake-sdk')).default;
+    
+    // Configure Snowflake driver logging
+    snowflakeSdk.configure({ logLevel: process.env.SNOWFLAKE_LOG_LEVEL || 'error' });
+  }
+  return snowflakeSdk;
+}
+
 /**
  * Execute a query and return results
  * @param {Object} connection - Snowflake connection object
@@ -125,16 +170,16 @@ export async function executeQuery(connection, query, options = {}) {
       throw new Error('Invalid query: must be a non-empty string');
     }
     
-    if (!query.trim().toUpperCase().startsWith('SELECT')) {
+    const queryType = getQueryType(query);
+    if (!['SELECT', 'SHOW', 'DESCRIBE'].includes(queryType)) {
       logger.warn('Non-SELECT query passed to executeQuery:', { query: query.substring(0, 100) });
     }
     
-    const statement = await connection.executeQueryAsync(query, options);
-    const rows = statement.getRows();
+    const { rows } = await connection.executeQueryAsync(query, options);
     
     logger.info('Query executed successfully', { 
       rowCount: rows.length,
-      queryType: getQueryType(query) 
+      queryType
     });
     
     return rows;
@@ -144,6 +189,50 @@ export async function executeQuery(connection, query, options = {}) {
   }
 }
 
+/**
+ * Execute a query without materializing its result set. The returned statement
+ * reports the total row count, and rows are pulled on demand with fetchRows.
+ * @param {Object} connection - Snowflake connection object
+ * @param {string} query - SQL query to execute
+ * @param {Object} options - Additional query options
+ * @returns {Promise<Object>} Executed Snowflake statement
+ */
+export async function executeStreamingQuery(connection, query, options = {}) {
+  try {
+    if (!query || typeof query !== 'string') {
+      throw new Error('Invalid query: must be a non-empty string');
+    }
+    
+    const { statement } = await connection.executeQueryAsync(query, { ...options, streamResult: true });
+    
+    logger.info('Query executed successfully', { 
+      rowCount: statement.getNumRows(),
+      queryType: getQueryType(query) 
+    });
+    
+    return statement;
+  } catch (error) {
+    logger.error('Error executing query:', { error, query });
+    throw error;
+  }
+}
+
+/**
+ * Fetch a range of rows from a statement executed by executeStreamingQuery.
+ * Only the result chunks covering the range are downloaded.
+ * @param {Object} statement - Snowflake statement
+ * @param {number} start - Index of the first row to fetch
+ * @param {number} end - Index of the last row to fetch (inclusive)
+ * @returns {Promise<Array>} Rows in the range as an array of objects
+ */
+export async function fetchRows(statement, start, end) {
+  const rows = [];
+  for await (const row of statement.streamRows({ start, end })) {
+    rows.push(row);
+  }
+  return rows;
+}
+
 /**
  * Execute a write query (INSERT, UPDATE, DELETE) and return affected rows
  * @param {Object} connection - Snowflake connection object
@@ -166,8 +255,8 @@ export async function executeWriteQuery(connection, query, options = {}) {
       throw new Error(`DDL queries (${queryType}) should use executeDDLQuery instead of executeWriteQuery`);
     }
     
-    const statement = await connection.executeQueryAsync(query, options);
-    const affectedRows = statement.getNumRows();
+    const { statement } = await connection.executeQueryAsync(query, options);
+    const affectedRows = statement.getNumUpdatedRows();
     
     logger.info('Write query executed successfully', { 
       affectedRows,
@@ -210,29 +299,77 @@ export async function executeDDLQuery(connection, query, options = {}) {
   }
 }
 
+/**
+ * Validate a database or schema name before it is embedded in SQL text
+ * @param {string} name - Identifier supplied by the caller
+ * @returns {string} The identifier, unchanged
+ */
+export function validateIdentifier(name) {
+  if (typeof name !== 'string' || !IDENTIFIER_REGEX.test(name)) {
+    throw new Error(`Invalid identifier: ${name}`);
+  }
+  return name;
+}
+
+/**
+ * Validate a possibly qualified object name (name, schema.name or
+ * database.schema.name) before it is embedded in SQL text
+ * @param {string} name - Object name supplied by the caller
+ * @returns {string} The object name, unchanged
+ */
+export function validateQualifiedName(name) {
+  if (typeof name !== 'string' || !QUALIFIED_NAME_REGEX.test(name)) {
+    throw new Error(`Invalid object name: ${name}`);
+  }
+  return name;
+}
+
+/**
+ * Convert an identifier to the form Snowflake stores it in, as seen in
+ * INFORMATION_SCHEMA: unquoted identifiers are uppercased, quoted ones keep
+ * their case and lose the surrounding quotes
+ * @param {string} name - Identifier supplied by the caller
+ * @returns {string} The stored object name
+ */
+export function normalizeIdentifier(name) {
+  validateIdentifier(name);
+  if (name.startsWith('"')) {
+    return name.slice(1, -1).replace(/""/g, '"');
+  }
+  return name.toUpperCase();
+}
+
+/**
+ * Quote an identifier in its canonical form, so that names which resolve to
+ * the same object (e.g. orders, ORDERS and "ORDERS") produce the same SQL text
+ * @param {string} name - Identifier supplied by the caller
+ * @returns {string} The stored name, double-quoted
+ */
+export function quoteIdentifier(name) {
+  return `"${normalizeIdentifier(name).replace(/"/g, '""')}"`;
+}
+
+/**
+ * Validate a possibly qualified object name and rewrite each part in its
+ * canonical quoted form (see quoteIdentifier)
+ * @param {string} name - Object name supplied by the caller
+ * @returns {string} The canonical object name
+ */
+export function canonicalizeQualifiedName(name) {
+  validateQualifiedName(name);
+  return name.match(IDENTIFIER_PARTS_REGEX).map(quoteIdentifier).join('.');
+}
+
 /**
  * Determine the type of SQL query (SELECT, INSERT, UPDATE, etc.)
  * @param {string} query - SQL query to analyze
  * @returns {string} Query type in uppercase
  */
-function getQueryType(query) {
+export function getQueryType(query) {
   if (!query || typeof query !== 'string') {
     return 'UNKNOWN';
   }
   
-  const trimmedQuery = query.trim().toUpperCase();
-  
-  if (trimmedQuery.startsWith('SELECT')) return 'SELECT';
-  if (trimmedQuery.startsWith('INSERT')) return 'INSERT';
-  if (trimmedQuery.startsWith('UPDATE')) return 'UPDATE';
-  if (trimmedQuery.startsWith('DELETE')) return 'DELETE';
-  if (trimmedQuery.startsWith('CREATE')) return 'CREATE';
-  if (trimmedQuery.startsWith('ALTER')) return 'ALTER';
-  if (trimmedQuery.startsWith('DROP')) return 'DROP';
-  if (trimmedQuery.startsWith('MERGE')) return 'MERGE';
-  if (trimmedQuery.startsWith('TRUNCATE')) return 'TRUNCATE';
-  if (trimmedQuery.startsWith('SHOW')) return 'SHOW';
-  if (trimmedQuery.startsWith('DESCRIBE')) return 'DESCRIBE';
-  
-  return 'UNKNOWN';
+  const match = QUERY_TYPE_REGEX.exec(query);
+  return match ? match[1].toUpperCase() : 'UNKNOWN';
 }
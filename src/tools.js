@@ -1,7 +1,112 @@
 import { z } from 'zod';
-import { executeQuery, executeWriteQuery, executeDDLQuery } from './snowflake.js';
+import {
+  executeStreamingQuery,
+  fetchRows,
+  executeWriteQuery,
+  executeDDLQuery,
+  getQueryType,
+  normalizeIdentifier,
+  quoteIdentifier,
+  canonicalizeQualifiedName
+} from './snowflake.js';
+import { createTtlCache, createSingleFlight } from './cache.js';
 import logger from './logger.js';
 
+// Result sets up to this size are returned in full; larger ones are summarized
+const MAX_FULL_RESULT_ROWS = 20;
+
+// Number of rows included in the summary of a larger result set
+const SAMPLE_ROWS = 10;
+
+// Large query results kept open for paging with fetch_query_results,
+// keyed by query ID. Only the most recent MAX_OPEN_RESULTS are kept.
+const openResults = new Map();
+const MAX_OPEN_RESULTS = 20;
+
+// Default and maximum page size for fetch_query_results
+const DEFAULT_PAGE_ROWS = 100;
+const MAX_PAGE_ROWS = 1000;
+
+// Maximum number of tables describe_columns accepts in one call
+const MAX_DESCRIBE_TABLES = 100;
+
+// Snowflake returns at most this many rows from a SHOW statement
+const MAX_SHOW_ROWS = 10000;
+
+// Optional scope parameters shared by the metadata tools
+const DATABASE_PARAM = z.string().optional().describe("Optional database name (uses current database if not specified)");
+const SCHEMA_PARAM = z.string().optional().describe("Optional schema name (uses current schema if not specified)");
+
+// Server-side filters shared by the list_* tools
+const SHOW_FILTER_PARAMS = {
+  like: z.string().optional().describe("Optional case-insensitive name pattern (% and _ are wildcards)"),
+  limit: z.number().int().positive().max(MAX_SHOW_ROWS).optional().describe("Optional maximum number of rows to return")
+};
+
+// Default time to live, in seconds, of cached SHOW results for objects that
+// rarely change (overridden by SNOWFLAKE_SHOW_CACHE_TTL, 0 disables caching)
+const DEFAULT_SHOW_CACHE_TTL = 60;
+
+// Default time to live, in seconds, of cached DESCRIBE results (overridden by
+// SNOWFLAKE_DESCRIBE_CACHE_TTL, 0 disables caching). Every successful
+// write_query and create_table call clears both the SHOW and DESCRIBE caches.
+const DEFAULT_DESCRIBE_CACHE_TTL = 60;
+
+// SHOW-based metadata tools, all registered through the same handler.
+// Results of the cached ones are reused until the cache TTL runs out, and
+// those with a fallback are re-read from INFORMATION_SCHEMA when SHOW hits
+// its row limit.
+const SHOW_TOOLS = [
+  {
+    name: "list_databases",
+    objectType: "DATABASES",
+    cached: true,
+    params: SHOW_FILTER_PARAMS
+  },
+  {
+    name: "list_schemas",
+    objectType: "SCHEMAS",
+    cached: true,
+    params: {
+      database: DATABASE_PARAM,
+      ...SHOW_FILTER_PARAMS
+    }
+  },
+  {
+    name: "list_tables",
+    objectType: "TABLES",
+    fallback: buildTablesQuery,
+    params: {
+      database: DATABASE_PARAM,
+      schema: SCHEMA_PARAM,
+      ...SHOW_FILTER_PARAMS
+    }
+  },
+  {
+    name: "get_user_roles",
+    objectType: "ROLES",
+    cached: true,
+    params: {}
+  }
+];
+
+// DESCRIBE-based metadata tools, all registered through the same handler.
+// argument names the tool parameter holding the (possibly qualified) object name.
+const DESCRIBE_TOOLS = [
+  {
+    name: "describe_table",
+    objectType: "TABLE",
+    argument: "table_name",
+    description: "Name of table to describe (can be fully qualified)"
+  },
+  {
+    name: "describe_view",
+    objectType: "VIEW",
+    argument: "view_name",
+    description: "Name of view to describe (can be fully qualified)"
+  }
+];
+
 /**
  * Register all Snowflake tools with the MCP server
  * @param {McpServer} server - MCP server instance
@@ -10,35 +115,68 @@ import logger from './logger.js';
 export function registerTools(server, connection) {
   logger.info('Registering Snowflake tools');
 
+  // Metadata result caches shared by the SHOW and DESCRIBE tools
+  const showCache = createTtlCache(getCacheTtl('SNOWFLAKE_SHOW_CACHE_TTL', DEFAULT_SHOW_CACHE_TTL) * 1000);
+  const describeCache = createTtlCache(getCacheTtl('SNOWFLAKE_DESCRIBE_CACHE_TTL', DEFAULT_DESCRIBE_CACHE_TTL) * 1000);
+  const metadataQueries = createSingleFlight();
+  
+  /**
+   * Drop every cached listing and description. Called after any statement that
+   * may change objects or the session's current database, schema or role; the
+   * statement text is not parsed, so invalidation is never narrowed to one object.
+   */
+  const invalidateMetadataCaches = () => {
+    showCache.clear();
+    describeCache.clear();
+    logger.debug('Metadata caches cleared');
+  };
+
   // Register read_query tool
   server.tool(
     "read_query",
     {
       query: z.string().describe("The SELECT SQL query to execute")
     },
-    async ({ query }) => {
-      logger.info('Tool execution request received', { tool: "read_query", query });
+    toolHandler("read_query", async ({ query }) => {
+      if (getQueryType(query) !== "SELECT") {
+        throw new Error("Only SELECT queries are allowed with read_query");
+      }
       
-      try {
-        if (!query.trim().toUpperCase().startsWith("SELECT")) {
-          throw new Error("Only SELECT queries are allowed with read_query");
-        }
-        
+      if (logger.isDebugEnabled()) {
         logger.debug('Executing read query', { query: query.substring(0, 100) + (query.length > 100 ? '...' : '') });
-        const result = await executeQuery(connection, query);
-        logger.info('Read query executed successfully', { rowCount: result.length });
-        
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error executing read query', { error: error.message });
-        const suggestion = getSuggestionForError("read_query", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
       }
-    }
+      const { text, totalRows } = await runQueryForDisplay(connection, query);
+      logger.info('Read query executed successfully', { rowCount: totalRows });
+      
+      return text;
+    })
+  );
+  
+  // Register fetch_query_results tool
+  server.tool(
+    "fetch_query_results",
+    {
+      query_id: z.string().describe("Query ID reported by read_query for a large result"),
+      offset: z.number().int().nonnegative().describe("Index of the first row to return (0-based)"),
+      limit: z.number().int().positive().max(MAX_PAGE_ROWS).optional().describe(`Maximum number of rows to return (default: ${DEFAULT_PAGE_ROWS})`)
+    },
+    toolHandler("fetch_query_results", async ({ query_id, offset, limit = DEFAULT_PAGE_ROWS }) => {
+      const statement = openResults.get(query_id);
+      if (!statement) {
+        throw new Error(`No open result set for query ${query_id}; run the query again with read_query`);
+      }
+      
+      const totalRows = statement.getNumRows();
+      if (offset >= totalRows) {
+        return `Offset ${offset} is past the end of the result set (${totalRows} rows).`;
+      }
+      
+      const end = Math.min(offset + limit, totalRows) - 1;
+      const rows = await fetchRows(statement, offset, end);
+      logger.info('Fetched query result page', { queryId: query_id, offset, rowCount: rows.length });
+      
+      return `Rows ${offset} to ${end} of ${totalRows}:\n\n${JSON.stringify(rows, null, 2)}`;
+    })
   );
   
   // Register write_query tool
@@ -47,34 +185,27 @@ export function registerTools(server, connection) {
     {
       query: z.string().describe("The SQL modification query")
     },
-    async ({ query }) => {
-      logger.info('Tool execution request received', { tool: "write_query", query });
+    toolHandler("write_query", async ({ query }) => {
+      const queryType = getQueryType(query);
+      if (queryType === "SELECT") {
+        throw new Error("Use read_query for SELECT queries");
+      }
+      if (["CREATE", "ALTER", "DROP"].includes(queryType)) {
+        throw new Error("Use create_table for DDL operations");
+      }
       
-      try {
-        if (query.trim().toUpperCase().startsWith("SELECT")) {
-          throw new Error("Use read_query for SELECT queries");
-        }
-        if (query.trim().toUpperCase().startsWith("CREATE") || 
-            query.trim().toUpperCase().startsWith("ALTER") || 
-            query.trim().toUpperCase().startsWith("DROP")) {
-          throw new Error("Use create_table for DDL operations");
-        }
-        
+      if (logger.isDebugEnabled()) {
         logger.debug('Executing write query', { query: query.substring(0, 100) + (query.length > 100 ? '...' : '') });
-        const result = await executeWriteQuery(connection, query);
-        logger.info('Write query executed successfully', { affectedRows: result.affected_rows });
-        
-        return {
-          content: [{ type: "text", text: `Query executed successfully. Rows affected: ${result.affected_rows}` }]
-        };
-      } catch (error) {
-        logger.error('Error executing write query', { error: error.message });
-        const suggestion = getSuggestionForError("write_query", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
       }
-    }
+      const result = await executeWriteQuery(connection, query);
+      logger.info('Write query executed successfully', { affectedRows: result.affected_rows });
+      
+      // Statements such as USE, GRANT and REVOKE change what unqualified SHOW and
+      // DESCRIBE statements resolve to
+      invalidateMetadataCaches();
+      
+      return `Query executed successfully. Rows affected: ${result.affected_rows}`;
+    })
   );
   
   // Register create_table tool
@@ -83,197 +214,137 @@ export function registerTools(server, connection) {
     {
       query: z.string().describe("CREATE TABLE SQL statement")
     },
-    async ({ query }) => {
-      logger.info('Tool execution request received', { tool: "create_table", query });
-      
-      try {
+    toolHandler("create_table", async ({ query }) => {
+      if (logger.isDebugEnabled()) {
         logger.debug('Executing DDL query', { query: query.substring(0, 100) + (query.length > 100 ? '...' : '') });
-        const result = await executeDDLQuery(connection, query);
-        logger.info('DDL query executed successfully');
-        
-        return {
-          content: [{ type: "text", text: "Table operation completed successfully." }]
-        };
-      } catch (error) {
-        logger.error('Error executing DDL query', { error: error.message });
-        const suggestion = getSuggestionForError("create_table", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
       }
-    }
-  );
-  
-  // Register list_databases tool
-  server.tool(
-    "list_databases",
-    {},
-    async () => {
-      logger.info('Tool execution request received', { tool: "list_databases" });
+      await executeDDLQuery(connection, query);
+      logger.info('DDL query executed successfully');
       
-      try {
-        const result = await executeQuery(connection, "SHOW DATABASES");
-        logger.info('List databases executed successfully');
-        
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error listing databases', { error: error.message });
-        const suggestion = getSuggestionForError("list_databases", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
-      }
-    }
+      // The DDL may have changed any cached listing or description
+      invalidateMetadataCaches();
+      
+      return "Table operation completed successfully.";
+    })
   );
   
-  // Register list_schemas tool
-  server.tool(
-    "list_schemas",
-    {
-      database: z.string().optional().describe("Optional database name (uses current database if not specified)")
-    },
-    async ({ database }) => {
-      logger.info('Tool execution request received', { tool: "list_schemas", database });
-      
-      try {
-        let listSchemasQuery = "SHOW SCHEMAS";
-        if (database) {
-          listSchemasQuery = `SHOW SCHEMAS IN DATABASE ${database}`;
+  // Register the SHOW-based metadata tools (list_databases, list_schemas, ...)
+  for (const { name, objectType, cached, fallback, params } of SHOW_TOOLS) {
+    server.tool(
+      name,
+      params,
+      toolHandler(name, async (args) => {
+        const query = buildShowQuery(objectType, args);
+        const cachedText = cached ? getCachedText(showCache, query) : undefined;
+        if (cachedText !== undefined) {
+          logger.debug('Returning cached show result', { tool: name, objectType, ...showCache.stats() });
+          return cachedText;
         }
         
-        const result = await executeQuery(connection, listSchemasQuery);
-        logger.info('List schemas executed successfully');
+        // Identical SHOW calls that arrive while one is running share its result.
+        // The flight is tied to the cache generation, so a call made after the
+        // cache was cleared never joins (or caches) a listing read before it.
+        const generation = showCache.generation();
+        const text = await metadataQueries(`${generation} ${query}`, async () => {
+          const statement = await executeStreamingQuery(connection, query);
+          logger.info('Show query executed successfully', { tool: name, objectType });
+          
+          // SHOW stops at MAX_SHOW_ROWS, so an unlimited result of that size may be
+          // incomplete. The row count is checked before the result is displayed, so
+          // a discarded SHOW result is never kept open for fetch_query_results.
+          let result;
+          if (fallback && !args.limit && statement.getNumRows() >= MAX_SHOW_ROWS) {
+            logger.warn('Show query reached the row limit, reading INFORMATION_SCHEMA instead', { tool: name, objectType });
+            const { query: fallbackQuery, binds } = fallback(args);
+            const fallbackResult = await runQueryForDisplay(connection, fallbackQuery, { binds });
+            result = {
+              ...fallbackResult,
+              text: `SHOW ${objectType} stopped at its ${MAX_SHOW_ROWS}-row limit, so this listing was read from INFORMATION_SCHEMA instead and its columns differ from SHOW ${objectType}.\n\n${fallbackResult.text}`
+            };
+          } else {
+            result = await formatStatementForDisplay(statement);
+          }
+          
+          if (cached) {
+            showCache.set(query, result, generation);
+          }
+          
+          return result.text;
+        });
         
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error listing schemas', { error: error.message });
-        const suggestion = getSuggestionForError("list_schemas", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
-      }
-    }
-  );
+        return text;
+      })
+    );
+  }
   
-  // Register list_tables tool
-  server.tool(
-    "list_tables",
-    {
-      database: z.string().optional().describe("Optional database name (uses current database if not specified)"),
-      schema: z.string().optional().describe("Optional schema name (uses current schema if not specified)")
-    },
-    async ({ database, schema }) => {
-      logger.info('Tool execution request received', { tool: "list_tables", database, schema });
-      
-      try {
-        let listTablesQuery = "SHOW TABLES";
-        if (database && schema) {
-          listTablesQuery = `SHOW TABLES IN ${database}.${schema}`;
-        } else if (schema) {
-          listTablesQuery = `SHOW TABLES IN SCHEMA ${schema}`;
-        } else if (database) {
-          listTablesQuery = `SHOW TABLES IN DATABASE ${database}`;
+  // Register the DESCRIBE-based tools (describe_table, describe_view)
+  for (const { name, objectType, argument, description } of DESCRIBE_TOOLS) {
+    server.tool(
+      name,
+      {
+        [argument]: z.string().describe(description)
+      },
+      toolHandler(name, async (args) => {
+        // The canonical name keeps the statement text the same for every spelling of the object
+        const objectName = canonicalizeQualifiedName(args[argument]);
+        const query = `DESCRIBE ${objectType} ${objectName}`;
+        const cacheKey = `${objectType} ${objectName}`;
+        const cachedText = getCachedText(describeCache, cacheKey);
+        if (cachedText !== undefined) {
+          logger.debug('Returning cached describe result', { tool: name, objectType, ...describeCache.stats() });
+          return cachedText;
         }
         
-        const result = await executeQuery(connection, listTablesQuery);
-        logger.info('List tables executed successfully');
+        // Identical DESCRIBE calls that arrive while one is running share its
+        // result, within the same cache generation (see the SHOW tools)
+        const generation = describeCache.generation();
+        const text = await metadataQueries(`${generation} ${cacheKey}`, async () => {
+          const result = await runQueryForDisplay(connection, query);
+          logger.info('Describe query executed successfully', { tool: name, objectType, ...describeCache.stats() });
+          describeCache.set(cacheKey, result, generation);
+          
+          return result.text;
+        });
         
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error listing tables', { error: error.message });
-        const suggestion = getSuggestionForError("list_tables", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
-      }
-    }
-  );
+        return text;
+      })
+    );
+  }
   
-  // Register describe_table tool
+  // Register describe_columns tool
   server.tool(
-    "describe_table",
+    "describe_columns",
     {
-      table_name: z.string().describe("Name of table to describe (can be fully qualified)")
+      table_names: z.array(z.string()).min(1).max(MAX_DESCRIBE_TABLES).describe("Names of the tables to describe, all in the same schema"),
+      database: z.string().optional().describe("Optional database name (uses current database if not specified; requires schema)"),
+      schema: SCHEMA_PARAM
     },
-    async ({ table_name }) => {
-      logger.info('Tool execution request received', { tool: "describe_table", table_name });
+    toolHandler("describe_columns", async (args) => {
+      const { query, binds } = buildColumnsQuery(args);
+      const { text } = await runQueryForDisplay(connection, query, { binds });
+      logger.info('Describe columns executed successfully', { tableCount: args.table_names.length });
       
-      try {
-        const result = await executeQuery(connection, `DESCRIBE TABLE ${table_name}`);
-        logger.info('Describe table executed successfully');
-        
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error describing table', { error: error.message });
-        const suggestion = getSuggestionForError("describe_table", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
-      }
-    }
+      return text;
+    })
   );
   
   // Register get_query_history tool
   server.tool(
     "get_query_history",
     {
-      limit: z.number().optional().describe("Maximum number of queries to return (default: 10)")
+      limit: z.number().int().positive().optional().describe("Maximum number of queries to return (default: 10)")
     },
-    async ({ limit = 10 }) => {
-      logger.info('Tool execution request received', { tool: "get_query_history", limit });
-      
-      try {
-        const result = await executeQuery(connection, 
-          `SELECT QUERY_ID, QUERY_TEXT, DATABASE_NAME, SCHEMA_NAME, 
-                  EXECUTION_STATUS, START_TIME, END_TIME, TOTAL_ELAPSED_TIME 
-           FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER()) 
-           ORDER BY START_TIME DESC 
-           LIMIT ${limit}`);
-        logger.info('Get query history executed successfully');
-        
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error getting query history', { error: error.message });
-        const suggestion = getSuggestionForError("get_query_history", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
-      }
-    }
-  );
-  
-  // Register get_user_roles tool
-  server.tool(
-    "get_user_roles",
-    {},
-    async () => {
-      logger.info('Tool execution request received', { tool: "get_user_roles" });
+    toolHandler("get_query_history", async ({ limit = 10 }) => {
+      const { text } = await runQueryForDisplay(connection, 
+        `SELECT QUERY_ID, QUERY_TEXT, DATABASE_NAME, SCHEMA_NAME, 
+                EXECUTION_STATUS, START_TIME, END_TIME, TOTAL_ELAPSED_TIME 
+         FROM TABLE(INFORMATION_SCHEMA.QUERY_HISTORY_BY_USER()) 
+         ORDER BY START_TIME DESC 
+         LIMIT ${limit}`);
+      logger.info('Get query history executed successfully');
       
-      try {
-        const result = await executeQuery(connection, "SHOW ROLES");
-        logger.info('Get user roles executed successfully');
-        
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error getting user roles', { error: error.message });
-        const suggestion = getSuggestionForError("get_user_roles", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
-      }
-    }
+      return text;
+    })
   );
   
   // Register get_table_sample tool
@@ -281,52 +352,261 @@ export function registerTools(server, connection) {
     "get_table_sample",
     {
       table_name: z.string().describe("Name of table to sample (can be fully qualified)"),
-      limit: z.number().optional().describe("Maximum number of rows to return (default: 10)")
+      limit: z.number().int().positive().optional().describe("Maximum number of rows to return (default: 10)")
     },
-    async ({ table_name, limit = 10 }) => {
-      logger.info('Tool execution request received', { tool: "get_table_sample", table_name, limit });
+    toolHandler("get_table_sample", async ({ table_name, limit = 10 }) => {
+      const { text } = await runQueryForDisplay(connection, `SELECT * FROM IDENTIFIER(?) LIMIT ${limit}`, {
+        binds: [canonicalizeQualifiedName(table_name)]
+      });
+      logger.info('Get table sample executed successfully');
       
-      try {
-        const result = await executeQuery(connection, `SELECT * FROM ${table_name} LIMIT ${limit}`);
-        logger.info('Get table sample executed successfully');
-        
-        return {
-          content: [{ type: "text", text: formatToolResult(result) }]
-        };
-      } catch (error) {
-        logger.error('Error getting table sample', { error: error.message });
-        const suggestion = getSuggestionForError("get_table_sample", error);
-        return {
-          content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
-        };
-      }
-    }
+      return text;
+    })
   );
 }
 
+/**
+ * Read a result cache TTL from the environment
+ * @param {string} variable - Name of the environment variable
+ * @param {number} defaultTtl - TTL in seconds used when the variable is not set
+ * @returns {number} TTL in seconds, 0 when caching is disabled
+ */
+function getCacheTtl(variable, defaultTtl) {
+  if (!process.env[variable]) {
+    return defaultTtl;
+  }
+  
+  const ttl = parseInt(process.env[variable], 10);
+  if (Number.isNaN(ttl) || ttl < 0) {
+    throw new Error(`${variable} must be a non-negative integer`);
+  }
+  return ttl;
+}
+
+/**
+ * Look up a cached runQueryForDisplay result. A result that points at an open
+ * statement for paging is only reused while that statement is still kept open.
+ * @param {Object} cache - Cache created by createTtlCache
+ * @param {string} key - Cache key
+ * @returns {string|undefined} The cached response text, if still usable
+ */
+function getCachedText(cache, key) {
+  const result = cache.get(key);
+  if (!result || (result.queryId && !openResults.has(result.queryId))) {
+    return undefined;
+  }
+  return result.text;
+}
+
+/**
+ * Run a query and format its result for a tool response. Rows are streamed and
+ * only the ones formatToolResult displays are fetched; a larger result set is
+ * kept open so the rest can be paged through with fetch_query_results.
+ * @param {Object} connection - Snowflake connection object
+ * @param {string} query - SQL query to execute
+ * @param {Object} options - Additional execute options (e.g. binds)
+ * @returns {Promise<Object>} The response text, the total row count and, for a
+ * result kept open, its query ID
+ */
+async function runQueryForDisplay(connection, query, options = {}) {
+  const statement = await executeStreamingQuery(connection, query, options);
+  return formatStatementForDisplay(statement);
+}
+
+/**
+ * Format the result of a statement executed by executeStreamingQuery for a
+ * tool response (see runQueryForDisplay)
+ * @param {Object} statement - Statement executed by executeStreamingQuery
+ * @returns {Promise<Object>} The response text, the total row count and, for a
+ * result kept open, its query ID
+ */
+async function formatStatementForDisplay(statement) {
+  const totalRows = statement.getNumRows();
+  
+  if (totalRows <= MAX_FULL_RESULT_ROWS) {
+    const rows = totalRows > 0 ? await fetchRows(statement, 0, totalRows - 1) : [];
+    return { text: formatToolResult(rows, totalRows), totalRows };
+  }
+  
+  const rows = await fetchRows(statement, 0, SAMPLE_ROWS - 1);
+  const queryId = keepResultOpen(statement);
+  return {
+    text: `${formatToolResult(rows, totalRows)}\n\nUse fetch_query_results with query_id "${queryId}" and offset ${SAMPLE_ROWS} to read more rows.`,
+    totalRows,
+    queryId
+  };
+}
+
+/**
+ * Keep a streamed statement available to fetch_query_results, dropping the
+ * oldest open result set once MAX_OPEN_RESULTS are held
+ * @param {Object} statement - Statement executed by executeStreamingQuery
+ * @returns {string} Query ID to page through the result with
+ */
+function keepResultOpen(statement) {
+  const queryId = statement.getStatementId();
+  openResults.delete(queryId);
+  openResults.set(queryId, statement);
+  
+  if (openResults.size > MAX_OPEN_RESULTS) {
+    openResults.delete(openResults.keys().next().value);
+  }
+  return queryId;
+}
+
+/**
+ * Wrap a tool implementation with the request logging and error handling shared
+ * by every tool. The implementation returns the response text; a thrown error is
+ * turned into an error response with a troubleshooting suggestion.
+ * @param {string} toolName - The name of the tool
+ * @param {Function} run - Async function taking the tool arguments and returning text
+ * @returns {Function} MCP tool handler
+ */
+function toolHandler(toolName, run) {
+  return async (args = {}) => {
+    logger.info('Tool execution request received', { tool: toolName, ...args });
+    
+    try {
+      const text = await run(args);
+      return {
+        content: [{ type: "text", text }]
+      };
+    } catch (error) {
+      logger.error('Error executing tool', { tool: toolName, error: error.message });
+      const suggestion = getSuggestionForError(toolName, error);
+      return {
+        content: [{ type: "text", text: `Error: ${error.message}\n\n${suggestion}` }]
+      };
+    }
+  };
+}
+
+/**
+ * Build a SHOW statement for an object type, filtered by name pattern, scoped
+ * to a database and/or schema and limited to a number of rows
+ * @param {string} objectType - Plural object type, e.g. "TABLES"
+ * @param {Object} options - Optional database, schema, like and limit
+ * @returns {string} SHOW statement
+ */
+export function buildShowQuery(objectType, { database, schema, like, limit } = {}) {
+  // Canonical names keep the statement text, and so the cache key, stable
+  const databaseName = database ? quoteIdentifier(database) : null;
+  const schemaName = schema ? quoteIdentifier(schema) : null;
+  
+  let query = `SHOW ${objectType}`;
+  if (like) {
+    query += ` LIKE '${like.replace(/\\/g, '\\\\').replace(/'/g, "''")}'`;
+  }
+  
+  if (databaseName && schemaName) {
+    query += ` IN ${databaseName}.${schemaName}`;
+  } else if (schemaName) {
+    query += ` IN SCHEMA ${schemaName}`;
+  } else if (databaseName) {
+    query += ` IN DATABASE ${databaseName}`;
+  }
+  
+  if (limit) {
+    query += ` LIMIT ${limit}`;
+  }
+  return query;
+}
+
+/**
+ * Build a single INFORMATION_SCHEMA.COLUMNS query covering several tables of
+ * one schema, so they are described in one round trip instead of one
+ * DESCRIBE TABLE each. Without a schema the current schema is used, so a
+ * database can only be given together with a schema.
+ * @param {Object} args - Tool arguments
+ * @param {string[]} args.table_names - Table names
+ * @param {string} [args.database] - Database containing the tables
+ * @param {string} [args.schema] - Schema containing the tables
+ * @returns {Object} The query text and its bind values
+ */
+export function buildColumnsQuery({ table_names, database, schema }) {
+  // CURRENT_SCHEMA() names a schema of the current database, not of this one
+  if (database && !schema) {
+    throw new Error('A schema is required when a database is specified');
+  }
+  
+  const infoSchema = database ? `${quoteIdentifier(database)}.INFORMATION_SCHEMA` : 'INFORMATION_SCHEMA';
+  const binds = table_names.map(normalizeIdentifier);
+  const placeholders = binds.map(() => '?').join(', ');
+  
+  let schemaFilter = 'CURRENT_SCHEMA()';
+  if (schema) {
+    schemaFilter = '?';
+    binds.unshift(normalizeIdentifier(schema));
+  }
+  
+  const query = `SELECT TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT, COMMENT
+    FROM ${infoSchema}.COLUMNS
+    WHERE TABLE_SCHEMA = ${schemaFilter} AND TABLE_NAME IN (${placeholders})
+    ORDER BY TABLE_NAME, ORDINAL_POSITION`;
+  
+  return { query, binds };
+}
+
+/**
+ * Build the INFORMATION_SCHEMA.TABLES equivalent of list_tables' SHOW TABLES,
+ * which is not subject to the SHOW row limit
+ * @param {Object} args - Tool arguments
+ * @param {string} [args.database] - Database containing the tables
+ * @param {string} [args.schema] - Schema containing the tables
+ * @param {string} [args.like] - Case-insensitive table name pattern
+ * @returns {Object} The query text and its bind values
+ */
+function buildTablesQuery({ database, schema, like }) {
+  const infoSchema = database ? `${quoteIdentifier(database)}.INFORMATION_SCHEMA` : 'INFORMATION_SCHEMA';
+  const binds = [];
+  const filters = ["TABLE_TYPE NOT IN ('VIEW', 'MATERIALIZED VIEW')"];
+  
+  // Like SHOW TABLES: a database alone covers all of its schemas, no scope means the current schema
+  if (schema) {
+    filters.push('TABLE_SCHEMA = ?');
+    binds.push(normalizeIdentifier(schema));
+  } else if (database) {
+    filters.push("TABLE_SCHEMA <> 'INFORMATION_SCHEMA'");
+  } else {
+    filters.push('TABLE_SCHEMA = CURRENT_SCHEMA()');
+  }
+  if (like) {
+    filters.push('TABLE_NAME ILIKE ?');
+    binds.push(like);
+  }
+  
+  const query = `SELECT TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, ROW_COUNT, BYTES, CREATED, LAST_ALTERED, COMMENT
+    FROM ${infoSchema}.TABLES
+    WHERE ${filters.join(' AND ')}
+    ORDER BY TABLE_SCHEMA, TABLE_NAME`;
+  
+  return { query, binds };
+}
+
 /**
  * Format tool results for better readability
  * @param {any} result - The result to format
+ * @param {number} totalRows - Total rows in the result set, when only a preview was fetched
  * @returns {string} Formatted result as a string
  */
-function formatToolResult(result) {
+function formatToolResult(result, totalRows = result?.length) {
   if (!result) {
     return 'No results returned';
   }
   
   // Handle array results (typical for query results)
   if (Array.isArray(result)) {
-    if (result.length === 0) {
+    if (totalRows === 0) {
       return 'Query executed successfully. No rows returned.';
     }
     
     // For small result sets, return the full JSON
-    if (result.length <= 20) {
+    if (totalRows <= MAX_FULL_RESULT_ROWS) {
       return JSON.stringify(result, null, 2);
     }
     
     // For larger result sets, summarize and return a sample
-    return `Query returned ${result.length} rows. Here's a sample of the first 10:\n\n${JSON.stringify(result.slice(0, 10), null, 2)}\n\n...and ${result.length - 10} more rows.`;
+    return `Query returned ${totalRows} rows. Here's a sample of the first ${SAMPLE_ROWS}:\n\n${JSON.stringify(result.slice(0, SAMPLE_ROWS), null, 2)}\n\n...and ${totalRows - SAMPLE_ROWS} more rows.`;
   }
   
   // Handle objects (typical for write/DDL operations)
@@ -342,6 +622,13 @@ function formatToolResult(result) {
 function getSuggestionForError(toolName, error) {
   const errorMsg = error.message.toLowerCase();
   
+  // Rejected database, schema or table names. Checked first: Snowflake reports
+  // these as "SQL compilation error: invalid identifier ...", and the rejected
+  // name itself may contain words the checks below look for.
+  if (errorMsg.includes('invalid identifier') || errorMsg.includes('invalid object name')) {
+    return 'Object names may contain letters, digits, underscores and dollar signs; wrap any other name in double quotes (e.g. "My Table").';
+  }
+  
   // Authentication errors
   if (errorMsg.includes('authentication') || errorMsg.includes('login') || errorMsg.includes('password')) {
     return 'Check your Snowflake credentials in the .env file';
@@ -0,0 +1,106 @@
+import { expect } from 'chai';
+import sinon from 'sinon';
+
+// Import functions to test
+import { createTtlCache, createSingleFlight } from '../src/cache.js';
+
+describe('TTL Cache Module', () => {
+  let clock;
+
+  beforeEach(() => {
+    clock = sinon.useFakeTimers();
+  });
+
+  afterEach(() => {
+    clock.restore();
+  });
+
+  it('should return cached values until they expire', () => {
+    const cache = createTtlCache(1000);
+    cache.set('SHOW DATABASES', 'result');
+
+    clock.tick(999);
+    expect(cache.get('SHOW DATABASES')).to.equal('result');
+
+    clock.tick(1);
+    expect(cache.get('SHOW DATABASES')).to.be.undefined;
+  });
+
+  it('should not store anything when the TTL is 0', () => {
+    const cache = createTtlCache(0);
+    cache.set('SHOW DATABASES', 'result');
+
+    expect(cache.get('SHOW DATABASES')).to.be.undefined;
+  });
+
+  it('should evict the least recently used entry when full', () => {
+    const cache = createTtlCache(1000, 2);
+    cache.set('a', 1);
+    cache.set('b', 2);
+    cache.get('a');
+    cache.set('c', 3);
+
+    expect(cache.get('a')).to.equal(1);
+    expect(cache.get('b')).to.be.undefined;
+    expect(cache.get('c')).to.equal(3);
+  });
+
+  it('should remove all entries on clear', () => {
+    const cache = createTtlCache(1000);
+    cache.set('a', 1);
+    cache.clear();
+
+    expect(cache.get('a')).to.be.undefined;
+  });
+
+  it('should count hits and misses', () => {
+    const cache = createTtlCache(1000);
+    cache.get('a');
+    cache.set('a', 1);
+    cache.get('a');
+    cache.get('a');
+
+    expect(cache.stats()).to.deep.equal({ hits: 2, misses: 1, size: 1 });
+  });
+
+  it('should drop values computed before the last clear', () => {
+    const cache = createTtlCache(1000);
+    const generation = cache.generation();
+    cache.clear();
+    cache.set('a', 'stale', generation);
+
+    expect(cache.get('a')).to.be.undefined;
+
+    cache.set('a', 'fresh', cache.generation());
+    expect(cache.get('a')).to.equal('fresh');
+  });
+});
+
+describe('Single Flight', () => {
+  it('should share one in-flight call between identical keys', async () => {
+    const run = createSingleFlight();
+    const work = sinon.stub().resolves('result');
+
+    const results = await Promise.all([run('SHOW DATABASES', work), run('SHOW DATABASES', work)]);
+
+    expect(results).to.deep.equal(['result', 'result']);
+    expect(work.calledOnce).to.be.true;
+  });
+
+  it('should start a new call once the previous one has settled', async () => {
+    const run = createSingleFlight();
+    const work = sinon.stub();
+    work.onFirstCall().rejects(new Error('Query failed'));
+    work.onSecondCall().resolves('result');
+
+    try {
+      await run('SHOW DATABASES', work);
+      expect.fail('Should have thrown an error');
+    } catch (error) {
+      expect(error.message).to.equal('Query failed');
+    }
+
+    expect(await run('SHOW DATABASES', work)).to.equal('result');
+    expect(work.calledTwice).to.be.true;
+  });
+});
@@ -40,8 +40,11 @@ describe('Snowflake MCP Server', () => {
     // Mock Snowflake connection
     mockConnection = {
       executeQueryAsync: sandbox.stub().resolves({
-        getRows: () => [],
-        getNumRows: () => 0
+        statement: {
+          getNumRows: () => 0,
+          getNumUpdatedRows: () => 0
+        },
+        rows: []
       }),
       closeAsync: sandbox.stub().resolves()
     };
@@ -83,8 +86,9 @@ describe('Snowflake MCP Server', () => {
   });
   
   it('should initialize the server correctly', async () => {
-    // Import the main module (which will execute immediately)
-    const mainModule = await import('../src/index.js');
+    // Importing the module has no side effects; start the server explicitly
+    const { main } = await import('../src/index.js');
+    await main();
     
     // Verify environment variables were loaded
     expect(dotenv.config.called).to.be.true;
@@ -114,8 +118,8 @@ describe('Snowflake MCP Server', () => {
     snowflakeModule.initializeSnowflakeConnection.rejects(new Error('Test error'));
     
     try {
-      // Import the main module (which will execute immediately)
-      const mainModule = await import('../src/index.js');
+      const { main } = await import('../src/index.js');
+      await main();
     } catch (error) {
       // Error should be logged
       expect(logger.error.called).to.be.true;
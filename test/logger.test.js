@@ -8,7 +8,8 @@ const mockLogger = {
   info: sinon.stub(),
   warn: sinon.stub(),
   error: sinon.stub(),
-  debug: sinon.stub()
+  debug: sinon.stub(),
+  add: sinon.stub()
 };
 
 describe('Logger Module', () => {
@@ -57,7 +58,7 @@ describe('Logger Module', () => {
     expect(config.transports).to.have.lengthOf(1); // Only Console in development
   });
   
-  it('should create file transports in production environment', () => {
+  it('should not create file transports at import in production environment', () => {
     // Reset and recreate with production env
     sandbox.restore();
     winstonStub = sandbox.stub(winston, 'createLogger').returns(mockLogger);
@@ -68,7 +69,18 @@ describe('Logger Module', () => {
     logger = require('../src/logger.js').default;
     
     const config = winstonStub.firstCall.args[0];
-    expect(config.transports).to.have.lengthOf(3); // Console + 2 File transports
+    expect(config.transports).to.have.lengthOf(1); // File transports are added at startup
+  });
+  
+  it('should add file transports when file logging is enabled', () => {
+    const fs = require('fs');
+    const mkdirStub = sandbox.stub(fs, 'mkdirSync');
+    const { enableFileLogging } = require('../src/logger.js');
+    
+    enableFileLogging('/tmp/snowflake-mcp-logs');
+    
+    expect(mkdirStub.calledWith('/tmp/snowflake-mcp-logs', { recursive: true })).to.be.true;
+    expect(mockLogger.add.calledTwice).to.be.true;
   });
   
   it('should respect LOG_LEVEL environment variable', () => {
@@ -2,6 +2,7 @@ import { expect } from 'chai';
 import sinon from 'sinon';
 import snowflake from 'snowflake-sdk';
 import fs from 'fs';
+import { Readable } from 'stream';
 import { promisify } from 'util';
 import dotenv from 'dotenv';
 
@@ -12,8 +13,16 @@ dotenv.config();
 import {
   initializeSnowflakeConnection,
   executeQuery,
+  executeStreamingQuery,
+  fetchRows,
   executeWriteQuery,
-  executeDDLQuery
+  executeDDLQuery,
+  getQueryType,
+  validateIdentifier,
+  validateQualifiedName,
+  normalizeIdentifier,
+  quoteIdentifier,
+  canonicalizeQualifiedName
 } from '../src/snowflake.js';
 
 describe('Snowflake Connection Module', () => {
@@ -36,14 +45,21 @@ describe('Snowflake Connection Module', () => {
     
     // Mock Snowflake statement
     mockStatement = {
-      getRows: sandbox.stub().returns([{ col1: 'value1' }, { col1: 'value2' }]),
-      getNumRows: sandbox.stub().returns(2)
+      getNumRows: sandbox.stub().returns(2),
+      getNumUpdatedRows: sandbox.stub().returns(2),
+      streamRows: sandbox.stub().callsFake(({ start, end }) =>
+        Readable.from([{ col1: 'value1' }, { col1: 'value2' }].slice(start, end + 1))
+      )
     };
     
     // Mock Snowflake connection
     mockConnection = {
       connect: sandbox.stub().callsFake((callback) => callback(null, mockConnection)),
-      execute: sandbox.stub().callsFake((options, callback) => callback(null, mockStatement)),
+      execute: sandbox.stub().callsFake((options) => {
+        const rows = options.streamResult ? undefined : [{ col1: 'value1' }, { col1: 'value2' }];
+        options.complete(null, mockStatement, rows);
+        return mockStatement;
+      }),
       destroy: sandbox.stub().callsFake((callback) => callback(null))
     };
     
@@ -74,7 +90,8 @@ describe('Snowflake Connection Module', () => {
       expect(snowflake.createConnection.firstCall.args[0]).to.include({
         account: 'test-account',
         username: 'test-user',
-        password: 'test-password'
+        password: 'test-password',
+        clientSessionKeepAlive: true
       });
       expect(connection).to.have.property('executeQueryAsync');
       expect(connection).to.have.property('closeAsync');
@@ -98,6 +115,17 @@ describe('Snowflake Connection Module', () => {
       });
     });
     
+    it('should pass SNOWFLAKE_RESULT_PREFETCH to the driver', async () => {
+      process.env.SNOWFLAKE_RESULT_PREFETCH = '6';
+      
+      try {
+        await initializeSnowflakeConnection();
+        expect(snowflake.createConnection.firstCall.args[0].resultPrefetch).to.equal(6);
+      } finally {
+        delete process.env.SNOWFLAKE_RESULT_PREFETCH;
+      }
+    });
+    
     it('should throw an error if required environment variables are missing', async () => {
       delete process.env.SNOWFLAKE_ACCOUNT;
       
@@ -132,10 +160,21 @@ describe('Snowflake Connection Module', () => {
       const query = 'SELECT * FROM test_table';
       const result = await executeQuery(connection, query);
       
-      expect(connection.executeQueryAsync.calledOnce).to.be.true;
+      expect(mockConnection.execute.calledOnce).to.be.true;
       expect(result).to.deep.equal([{ col1: 'value1' }, { col1: 'value2' }]);
     });
     
+    it('should reject when the driver reports an error', async () => {
+      mockConnection.execute.callsFake((options) => options.complete(new Error('Query failed')));
+      
+      try {
+        await executeQuery(connection, 'SELECT * FROM missing_table');
+        expect.fail('Should have thrown an error');
+      } catch (error) {
+        expect(error.message).to.equal('Query failed');
+      }
+    });
+    
     it('should throw an error for invalid queries', async () => {
       try {
         await executeQuery(connection, null);
@@ -146,6 +185,29 @@ describe('Snowflake Connection Module', () => {
     });
   });
   
+  describe('executeStreamingQuery', () => {
+    let connection;
+    
+    beforeEach(async () => {
+      connection = await initializeSnowflakeConnection();
+    });
+    
+    it('should execute with streamResult and return the statement', async () => {
+      const statement = await executeStreamingQuery(connection, 'SELECT * FROM test_table');
+      
+      expect(mockConnection.execute.firstCall.args[0].streamResult).to.be.true;
+      expect(statement).to.equal(mockStatement);
+    });
+    
+    it('should fetch only the requested range of rows', async () => {
+      const statement = await executeStreamingQuery(connection, 'SELECT * FROM test_table');
+      const rows = await fetchRows(statement, 0, 0);
+      
+      expect(mockStatement.streamRows.calledOnceWith({ start: 0, end: 0 })).to.be.true;
+      expect(rows).to.deep.equal([{ col1: 'value1' }]);
+    });
+  });
+  
   describe('executeWriteQuery', () => {
     let connection;
     
@@ -157,7 +219,7 @@ describe('Snowflake Connection Module', () => {
       const query = 'INSERT INTO test_table VALUES (1, "test")';
       const result = await executeWriteQuery(connection, query);
       
-      expect(connection.executeQueryAsync.calledOnce).to.be.true;
+      expect(mockConnection.execute.calledOnce).to.be.true;
       expect(result).to.deep.equal({ affected_rows: 2 });
     });
     
@@ -191,8 +253,74 @@ describe('Snowflake Connection Module', () => {
       const query = 'CREATE TABLE test_table (id INT)';
       const result = await executeDDLQuery(connection, query);
       
-      expect(connection.executeQueryAsync.calledOnce).to.be.true;
+      expect(mockConnection.execute.calledOnce).to.be.true;
       expect(result).to.deep.equal({ success: true, query_type: 'CREATE' });
     });
   });
+  
+  describe('getQueryType', () => {
+    it('should read the leading keyword regardless of case and whitespace', () => {
+      expect(getQueryType('  select * from t')).to.equal('SELECT');
+      expect(getQueryType('\n\tInsert into t values (1)')).to.equal('INSERT');
+      expect(getQueryType('SHOW TABLES')).to.equal('SHOW');
+    });
+    
+    it('should not match keywords that are only a prefix of a longer word', () => {
+      expect(getQueryType('SELECTED_ROWS')).to.equal('UNKNOWN');
+      expect(getQueryType(null)).to.equal('UNKNOWN');
+    });
+  });
+  
+  describe('validateIdentifier', () => {
+    it('should accept unquoted and quoted identifiers', () => {
+      expect(validateIdentifier('MY_DB$1')).to.equal('MY_DB$1');
+      expect(validateIdentifier('"My ""odd"" db"')).to.equal('"My ""odd"" db"');
+    });
+    
+    it('should reject identifiers that could alter the statement', () => {
+      expect(() => validateIdentifier('db; DROP TABLE t')).to.throw('Invalid identifier');
+      expect(() => validateIdentifier('db.schema')).to.throw('Invalid identifier');
+    });
+  });
+  
+  describe('validateQualifiedName', () => {
+    it('should accept names qualified with database and schema', () => {
+      expect(validateQualifiedName('orders')).to.equal('orders');
+      expect(validateQualifiedName('SALES.PUBLIC."Order Items"')).to.equal('SALES.PUBLIC."Order Items"');
+    });
+    
+    it('should reject malformed or over-qualified names', () => {
+      expect(() => validateQualifiedName('a.b.c.d')).to.throw('Invalid object name');
+      expect(() => validateQualifiedName('orders LIMIT 1')).to.throw('Invalid object name');
+      expect(() => validateQualifiedName('orders.')).to.throw('Invalid object name');
+    });
+  });
+  
+  describe('normalizeIdentifier', () => {
+    it('should uppercase unquoted identifiers and unquote quoted ones', () => {
+      expect(normalizeIdentifier('orders')).to.equal('ORDERS');
+      expect(normalizeIdentifier('"Order ""Items"""')).to.equal('Order "Items"');
+    });
+    
+    it('should reject invalid identifiers', () => {
+      expect(() => normalizeIdentifier('orders; DROP')).to.throw('Invalid identifier');
+    });
+  });
+  
+  describe('canonicalizeQualifiedName', () => {
+    it('should give names of the same object the same text', () => {
+      expect(quoteIdentifier('orders')).to.equal('"ORDERS"');
+      expect(canonicalizeQualifiedName('sales.Public.orders')).to.equal('"SALES"."PUBLIC"."ORDERS"');
+      expect(canonicalizeQualifiedName('"SALES".PUBLIC."ORDERS"')).to.equal('"SALES"."PUBLIC"."ORDERS"');
+    });
+    
+    it('should keep quoted parts, including dots and quotes, intact', () => {
+      expect(canonicalizeQualifiedName('sales."Order.Items"')).to.equal('"SALES"."Order.Items"');
+      expect(canonicalizeQualifiedName('"Say ""hi"""')).to.equal('"Say ""hi"""');
+    });
+    
+    it('should reject malformed names', () => {
+      expect(() => canonicalizeQualifiedName('orders LIMIT 1')).to.throw('Invalid object name');
+    });
+  });
 });
@@ -0,0 +1,405 @@
+import { expect } from 'chai';
+import sinon from 'sinon';
+import snowflake from 'snowflake-sdk';
+import { Readable } from 'stream';
+
+// Import functions to test
+import { initializeSnowflakeConnection } from '../src/snowflake.js';
+import { registerTools, buildShowQuery, buildColumnsQuery } from '../src/tools.js';
+
+/**
+ * Build a result set of numbered rows
+ * @param {number} count - Number of rows
+ * @returns {Object[]} Rows with an ID column
+ */
+function makeRows(count) {
+  return Array.from({ length: count }, (_, i) => ({ ID: i }));
+}
+
+describe('Tools Module', () => {
+  let sandbox;
+  let mockConnection;
+  let tools;
+  let rowsForQuery;
+  let holdPrefix;
+  let heldStatements;
+  let statementCount = 0;
+
+  /**
+   * Call a registered tool and return the text of its response
+   * @param {string} name - Tool name
+   * @param {Object} args - Tool arguments
+   * @returns {Promise<string>} Response text
+   */
+  async function callTool(name, args = {}) {
+    const response = await tools[name](args);
+    return response.content[0].text;
+  }
+
+  /**
+   * Count the statements executed whose SQL text starts with a prefix
+   * @param {string} prefix - Start of the SQL text
+   * @returns {number} Number of matching executions
+   */
+  function countExecuted(prefix) {
+    return mockConnection.execute.getCalls().filter((call) => call.args[0].sqlText.startsWith(prefix)).length;
+  }
+
+  beforeEach(async () => {
+    // Create a sandbox for stubs
+    sandbox = sinon.createSandbox();
+
+    // Mock environment variables
+    process.env.SNOWFLAKE_ACCOUNT = 'test-account';
+    process.env.SNOWFLAKE_USERNAME = 'test-user';
+    process.env.SNOWFLAKE_PASSWORD = 'test-password';
+    process.env.SNOWFLAKE_WAREHOUSE = 'test-warehouse';
+    delete process.env.SNOWFLAKE_PRIVATE_KEY_PATH;
+
+    // Every statement returns the rows chosen by the test for its SQL text
+    rowsForQuery = () => [];
+    
+    // Statements starting with holdPrefix only complete when the test releases them
+    holdPrefix = null;
+    heldStatements = [];
+
+    // Mock Snowflake connection
+    mockConnection = {
+      connect: sandbox.stub().callsFake((callback) => callback(null, mockConnection)),
+      execute: sandbox.stub().callsFake((options) => {
+        statementCount += 1;
+        const queryId = `query-${statementCount}`;
+        const rows = rowsForQuery(options.sqlText);
+        const statement = {
+          getStatementId: () => queryId,
+          getNumRows: () => rows.length,
+          getNumUpdatedRows: () => rows.length,
+          streamRows: ({ start, end }) => Readable.from(rows.slice(start, end + 1))
+        };
+        const complete = () => options.complete(null, statement, options.streamResult ? undefined : rows);
+        if (holdPrefix && options.sqlText.startsWith(holdPrefix)) {
+          heldStatements.push(complete);
+        } else {
+          complete();
+        }
+        return statement;
+      })
+    };
+
+    // Stub Snowflake SDK
+    sandbox.stub(snowflake, 'createConnection').returns(mockConnection);
+    sandbox.stub(snowflake, 'configure').returns();
+
+    // Capture tool handlers as the MCP server would register them
+    tools = {};
+    const server = {
+      tool: (name, params, handler) => {
+        tools[name] = handler;
+      }
+    };
+    registerTools(server, await initializeSnowflakeConnection());
+  });
+
+  /**
+   * Complete every held statement and stop holding new ones
+   */
+  function releaseHeldStatements() {
+    holdPrefix = null;
+    heldStatements.splice(0).forEach((complete) => complete());
+  }
+
+  afterEach(() => {
+    // Restore stubs
+    sandbox.restore();
+  });
+
+  describe('fetch_query_results', () => {
+    /**
+     * Run read_query on a result of the given size and return its query ID
+     * @param {number} rowCount - Rows in the result
+     * @returns {Promise<string>} Query ID from the paging hint
+     */
+    async function openResult(rowCount) {
+      rowsForQuery = () => makeRows(rowCount);
+      const text = await callTool('read_query', { query: 'SELECT * FROM orders' });
+      return /query_id "([^"]+)"/.exec(text)[1];
+    }
+
+    it('should return the requested page of a large read_query result', async () => {
+      const queryId = await openResult(25);
+
+      const page = await callTool('fetch_query_results', { query_id: queryId, offset: 10, limit: 5 });
+
+      const [header, body] = page.split('\n\n');
+      expect(header).to.equal('Rows 10 to 14 of 25:');
+      expect(JSON.parse(body)).to.deep.equal(makeRows(25).slice(10, 15));
+    });
+
+    it('should stop the page at the end of the result set', async () => {
+      const queryId = await openResult(25);
+
+      const page = await callTool('fetch_query_results', { query_id: queryId, offset: 20 });
+
+      expect(page).to.match(/^Rows 20 to 24 of 25:/);
+    });
+
+    it('should report an offset past the end of the result set', async () => {
+      const queryId = await openResult(25);
+
+      const page = await callTool('fetch_query_results', { query_id: queryId, offset: 25 });
+
+      expect(page).to.equal('Offset 25 is past the end of the result set (25 rows).');
+    });
+
+    it('should return an error for an unknown query ID', async () => {
+      const page = await callTool('fetch_query_results', { query_id: 'unknown', offset: 0 });
+
+      expect(page).to.match(/^Error: No open result set for query unknown/);
+    });
+
+    it('should not keep results that fit in the response open', async () => {
+      rowsForQuery = () => makeRows(5);
+      const text = await callTool('read_query', { query: 'SELECT * FROM orders' });
+
+      expect(text).not.to.include('fetch_query_results');
+    });
+
+    it('should evict the oldest open result once more than 20 are open', async () => {
+      const queryIds = [];
+      for (let i = 0; i < 21; i++) {
+        queryIds.push(await openResult(25));
+      }
+
+      const oldest = await callTool('fetch_query_results', { query_id: queryIds[0], offset: 10 });
+      const second = await callTool('fetch_query_results', { query_id: queryIds[1], offset: 10 });
+
+      expect(oldest).to.match(/^Error: No open result set/);
+      expect(second).to.match(/^Rows 10 to 24 of 25:/);
+    });
+  });
+
+  describe('list_tables', () => {
+    it('should read INFORMATION_SCHEMA when SHOW TABLES hits its row limit', async () => {
+      rowsForQuery = (sqlText) => (sqlText.startsWith('SHOW') ? makeRows(10000) : makeRows(3));
+
+      const text = await callTool('list_tables', { database: 'sales', schema: 'public' });
+
+      const fallback = mockConnection.execute.lastCall.args[0];
+      expect(fallback.sqlText).to.include('FROM "SALES".INFORMATION_SCHEMA.TABLES');
+      expect(fallback.binds).to.deep.equal(['PUBLIC']);
+      expect(text).to.match(/^SHOW TABLES stopped at its 10000-row limit/);
+      expect(text).to.include(JSON.stringify(makeRows(3), null, 2));
+    });
+
+    it('should not keep the discarded SHOW TABLES result open', async () => {
+      rowsForQuery = (sqlText) => (sqlText.startsWith('SHOW') ? makeRows(10000) : makeRows(3));
+
+      await callTool('list_tables', { database: 'sales', schema: 'public' });
+
+      const showQueryId = mockConnection.execute.firstCall.returnValue.getStatementId();
+      const page = await callTool('fetch_query_results', { query_id: showQueryId, offset: 10 });
+      expect(page).to.match(/^Error: No open result set/);
+    });
+
+    it('should not fall back when a limit was requested', async () => {
+      rowsForQuery = () => makeRows(10000);
+
+      await callTool('list_tables', { limit: 10000 });
+
+      expect(countExecuted('SELECT')).to.equal(0);
+    });
+  });
+
+  describe('SHOW result cache', () => {
+    it('should reuse a cached listing', async () => {
+      rowsForQuery = () => [{ name: 'PUBLIC' }];
+
+      const first = await callTool('list_schemas');
+      const second = await callTool('list_schemas');
+
+      expect(second).to.equal(first);
+      expect(countExecuted('SHOW SCHEMAS')).to.equal(1);
+    });
+
+    it('should query again after write_query changes the session', async () => {
+      rowsForQuery = () => [{ name: 'PUBLIC' }];
+
+      await callTool('list_schemas');
+      await callTool('write_query', { query: 'USE DATABASE OTHER_DB' });
+      await callTool('list_schemas');
+
+      expect(countExecuted('SHOW SCHEMAS')).to.equal(2);
+    });
+
+    it('should share one query between identical concurrent calls', async () => {
+      rowsForQuery = () => [{ name: 'SALES' }];
+      holdPrefix = 'SHOW DATABASES';
+
+      const first = callTool('list_databases');
+      const second = callTool('list_databases');
+      await new Promise(setImmediate);
+      expect(countExecuted('SHOW DATABASES')).to.equal(1);
+
+      releaseHeldStatements();
+      expect(await second).to.equal(await first);
+    });
+
+    it('should not cache a listing read before create_table cleared the cache', async () => {
+      rowsForQuery = () => [{ name: 'SALES' }];
+      holdPrefix = 'SHOW DATABASES';
+
+      const beforeDdl = callTool('list_databases');
+      await new Promise(setImmediate);
+      await callTool('create_table', { query: 'CREATE TABLE orders (id INT)' });
+      releaseHeldStatements();
+      await beforeDdl;
+
+      await callTool('list_databases');
+      expect(countExecuted('SHOW DATABASES')).to.equal(2);
+    });
+
+    it('should not join a listing started before create_table cleared the cache', async () => {
+      rowsForQuery = () => [{ name: 'SALES' }];
+      holdPrefix = 'SHOW DATABASES';
+
+      const beforeDdl = callTool('list_databases');
+      await new Promise(setImmediate);
+      await callTool('create_table', { query: 'CREATE TABLE orders (id INT)' });
+      const afterDdl = callTool('list_databases');
+      await new Promise(setImmediate);
+
+      expect(countExecuted('SHOW DATABASES')).to.equal(2);
+      releaseHeldStatements();
+      await Promise.all([beforeDdl, afterDdl]);
+    });
+  });
+
+  describe('object name handling', () => {
+    it('should describe objects by their canonical name', async () => {
+      await callTool('describe_table', { table_name: 'sales.public.orders' });
+      await callTool('describe_view', { view_name: 'sales."Order View"' });
+
+      const [describeTable, describeView] = mockConnection.execute.getCalls().map((call) => call.args[0]);
+      expect(describeTable.sqlText).to.equal('DESCRIBE TABLE "SALES"."PUBLIC"."ORDERS"');
+      expect(describeTable.binds).to.be.undefined;
+      expect(describeView.sqlText).to.equal('DESCRIBE VIEW "SALES"."Order View"');
+    });
+
+    it('should bind the sampled table name through IDENTIFIER(?)', async () => {
+      await callTool('get_table_sample', { table_name: 'sales.public.orders', limit: 5 });
+
+      const options = mockConnection.execute.lastCall.args[0];
+      expect(options.sqlText).to.equal('SELECT * FROM IDENTIFIER(?) LIMIT 5');
+      expect(options.binds).to.deep.equal(['"SALES"."PUBLIC"."ORDERS"']);
+    });
+
+    it('should reject malformed object names without querying', async () => {
+      const text = await callTool('describe_table', { table_name: 'orders; DROP TABLE orders' });
+
+      expect(text).to.match(/^Error: Invalid object name/);
+      expect(mockConnection.execute.called).to.be.false;
+    });
+  });
+
+  describe('error suggestions', () => {
+    const NAME_HINT = 'wrap any other name in double quotes';
+
+    it('should suggest quoting for names rejected before querying', async () => {
+      const schemas = await callTool('list_schemas', { database: 'mysql-db' });
+      const description = await callTool('describe_table', { table_name: 'access-log' });
+
+      expect(schemas).to.match(/^Error: Invalid identifier: mysql-db/);
+      expect(schemas).to.include(NAME_HINT);
+      expect(description).to.match(/^Error: Invalid object name: access-log/);
+      expect(description).to.include(NAME_HINT);
+    });
+
+    it('should suggest quoting for identifiers rejected by Snowflake', async () => {
+      rowsForQuery = () => {
+        throw new Error("SQL compilation error: error line 1 at position 7\ninvalid identifier 'ORDER_DATE'");
+      };
+
+      const text = await callTool('read_query', { query: 'SELECT order_date FROM orders' });
+
+      expect(text).to.include(NAME_HINT);
+      expect(text).not.to.include('syntax error');
+    });
+  });
+
+  describe('DESCRIBE result cache', () => {
+    it('should reuse a cached description', async () => {
+      rowsForQuery = () => [{ name: 'ID', type: 'NUMBER(38,0)' }];
+
+      await callTool('describe_table', { table_name: 'orders' });
+      await callTool('describe_table', { table_name: 'ORDERS' });
+
+      expect(countExecuted('DESCRIBE TABLE')).to.equal(1);
+    });
+
+    it('should describe again after write_query changes the session', async () => {
+      rowsForQuery = () => [{ name: 'ID', type: 'NUMBER(38,0)' }];
+
+      await callTool('describe_table', { table_name: 'orders' });
+      await callTool('write_query', { query: 'USE SCHEMA OTHER_SCHEMA' });
+      await callTool('describe_table', { table_name: 'orders' });
+
+      expect(countExecuted('DESCRIBE TABLE')).to.equal(2);
+    });
+  });
+});
+
+describe('buildShowQuery', () => {
+  it('should build an unscoped SHOW statement', () => {
+    expect(buildShowQuery('TABLES')).to.equal('SHOW TABLES');
+  });
+
+  it('should scope to a database, a schema or both', () => {
+    expect(buildShowQuery('TABLES', { database: 'sales' })).to.equal('SHOW TABLES IN DATABASE "SALES"');
+    expect(buildShowQuery('TABLES', { schema: 'public' })).to.equal('SHOW TABLES IN SCHEMA "PUBLIC"');
+    expect(buildShowQuery('TABLES', { database: 'sales', schema: 'public' })).to.equal('SHOW TABLES IN "SALES"."PUBLIC"');
+  });
+
+  it('should put LIKE before the scope and LIMIT last', () => {
+    expect(buildShowQuery('TABLES', { database: 'sales', schema: 'public', like: 'ORD%', limit: 50 }))
+      .to.equal(`SHOW TABLES LIKE 'ORD%' IN "SALES"."PUBLIC" LIMIT 50`);
+  });
+
+  it('should escape quotes and backslashes in the LIKE pattern', () => {
+    expect(buildShowQuery('TABLES', { like: "o'b\\x%" })).to.equal("SHOW TABLES LIKE 'o''b\\\\x%'");
+  });
+
+  it('should reject invalid database and schema names', () => {
+    expect(() => buildShowQuery('TABLES', { database: 'sales; DROP' })).to.throw('Invalid identifier');
+    expect(() => buildShowQuery('TABLES', { schema: 'a.b' })).to.throw('Invalid identifier');
+  });
+});
+
+describe('buildColumnsQuery', () => {
+  it('should filter on the current schema when no scope is given', () => {
+    const { query, binds } = buildColumnsQuery({ table_names: ['orders', '"Line Items"'] });
+
+    expect(query).to.include('FROM INFORMATION_SCHEMA.COLUMNS');
+    expect(query).to.include('TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME IN (?, ?)');
+    expect(binds).to.deep.equal(['ORDERS', 'Line Items']);
+  });
+
+  it('should bind the schema and quote the database', () => {
+    const { query, binds } = buildColumnsQuery({ table_names: ['orders'], database: 'sales', schema: 'public' });
+
+    expect(query).to.include('FROM "SALES".INFORMATION_SCHEMA.COLUMNS');
+    expect(query).to.include('TABLE_SCHEMA = ? AND TABLE_NAME IN (?)');
+    expect(binds).to.deep.equal(['PUBLIC', 'ORDERS']);
+  });
+
+  it('should bind the schema of the current database', () => {
+    const { query, binds } = buildColumnsQuery({ table_names: ['orders'], schema: 'public' });
+
+    expect(query).to.include('FROM INFORMATION_SCHEMA.COLUMNS');
+    expect(binds).to.deep.equal(['PUBLIC', 'ORDERS']);
+  });
+
+  it('should require a schema when a database is given', () => {
+    expect(() => buildColumnsQuery({ table_names: ['orders'], database: 'sales' }))
+      .to.throw('A schema is required when a database is specified');
+  });
+});